@@ -19,12 +19,13 @@ Usage:
 from .config import Config
 from .workflow import ResearchAssistantWorkflow
 from .worker import run_research_worker
-from .client import start_research_workflow
+from .client import start_research_workflow, get_client
 
 __version__ = "1.0.0"
 __all__ = [
     "Config",
     "ResearchAssistantWorkflow", 
     "run_research_worker",
-    "start_research_workflow"
+    "start_research_workflow",
+    "get_client"
 ] 
\ No newline at end of file
@@ -1,11 +1,15 @@
 """Activity definitions for the research assistant workflow"""
 
 from .planning_activity import planning_activity_with_langgraph
-from .research_activity import research_section_activity_with_langgraph  
+from .research_activity import (
+    research_section_activity_with_langgraph,
+    research_sections_batched_activity_with_langgraph,
+)
 from .report_activity import report_generation_activity_with_langgraph
 
 __all__ = [
     "planning_activity_with_langgraph",
     "research_section_activity_with_langgraph",
+    "research_sections_batched_activity_with_langgraph",
     "report_generation_activity_with_langgraph",
 ] 
\ No newline at end of file
@@ -1,127 +1,164 @@
+from functools import lru_cache
 from temporalio import activity
 from temporalio.exceptions import ApplicationError
-import uuid
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.exceptions import OutputParserException
 
-from ..config import Config
-from ..schemas.types import ResearchPlanDict, PlanningGraphState, ResearchPlan
+from ..providers import get_llm
+from ..schemas.types import ResearchPlanDict, PlanningGraphState, PlanningOutput, QueryPlan
 from ..utils.graph_builder import GraphBuilder, log_graph_execution
 
-@activity.defn
-async def planning_activity_with_langgraph(topic: str, max_sections: int) -> ResearchPlanDict:
-    """Planning activity using LangGraph StateGraph with checkpointing"""
-    activity.logger.info(f"[Planning] Starting LangGraph-based planning for: {topic}")
+# Prompt and parser are static, so build them once at import time
+_CREATE_PLAN_PROMPT = ChatPromptTemplate.from_template("""
+    Analyze this research topic and create a detailed research plan for it: {topic}
     
-    try:
-        # Import LangChain components inside the activity to avoid sandbox issues
-        from langchain_core.messages import HumanMessage
-        from langchain_core.prompts import ChatPromptTemplate
-        from langchain_core.output_parsers import PydanticOutputParser
+    First, analyze the topic:
+    - What are the main aspects to research?
+    - What methodology would be most appropriate?
+    - What are the key areas that need coverage?
+    
+    Then, based on that analysis, create the research plan.
+    
+    Plan requirements:
+    - Exactly {max_sections} sections
+    - Each section should focus on a specific, distinct aspect
+    - Sections should be comprehensive and non-overlapping
+    - Include appropriate research methodology
+    
+    Put the analysis of the research scope and approach in the "analysis"
+    field and the research plan in the "plan" field.
+    
+    {format_instructions}
+    """)
+
+_GENERATE_ALL_QUERIES_PROMPT = ChatPromptTemplate.from_template("""
+    Generate {search_depth} specific, diverse search queries for each section
+    of this research plan.
+    
+    Main Topic: {topic}
+    
+    Sections:
+    {sections}
+    
+    Requirements:
+    - Queries should be specific and focused
+    - Cover different aspects of each section
+    - Use varied terminology and approaches
+    - Target different types of information sources
+    - Identify each section by its number in the list above
+    
+    {format_instructions}
+    """)
+
+_PLANNING_PARSER = PydanticOutputParser(pydantic_object=PlanningOutput)
+_PLANNING_FORMAT_INSTRUCTIONS = _PLANNING_PARSER.get_format_instructions()
+
+_QUERY_PLAN_PARSER = PydanticOutputParser(pydantic_object=QueryPlan)
+_QUERY_PLAN_FORMAT_INSTRUCTIONS = _QUERY_PLAN_PARSER.get_format_instructions()
+
+@lru_cache(maxsize=1)
+def _build_planning_graph():
+    """Build and compile the planning graph once per worker process
+    
+    Nodes only depend on the graph state, so the compiled graph is safely
+    reused by every activity call.
+    """
+    llm = get_llm()
+    
+    async def create_plan_node(state: PlanningGraphState) -> PlanningGraphState:
+        """Analyze the topic and create the research plan in a single LLM call"""
+        log_graph_execution("Planning", "Analyzing topic and creating plan", "%d sections for %s", state['max_sections'], state['topic'])
+        
+        formatted_prompt = _CREATE_PLAN_PROMPT.format(
+            topic=state["topic"],
+            max_sections=state["max_sections"],
+            format_instructions=_PLANNING_FORMAT_INSTRUCTIONS
+        )
+        
+        response = await llm.ainvoke([HumanMessage(content=formatted_prompt)])
+        planning_output = _PLANNING_PARSER.parse(response.content)
+        research_plan = planning_output.plan
         
-        def analyze_topic_node(state: PlanningGraphState) -> PlanningGraphState:
-            """Analyze the research topic and create initial structure"""
-            llm = Config.get_llm()
-            log_graph_execution("Planning", "Analyzing topic", state['topic'])
-            
-            prompt = ChatPromptTemplate.from_template("""
-            Analyze this research topic and provide initial insights: {topic}
-            
-            Consider:
-            - What are the main aspects to research?
-            - What methodology would be most appropriate?
-            - What are the key areas that need coverage?
-            
-            Provide a structured analysis of the research scope and approach.
-            """)
-            
-            response = llm.invoke([HumanMessage(content=prompt.format(topic=state["topic"]))])
-            
-            return {
-                **state,
-                "analysis_complete": True,
-                "messages": [response]
-            }
+        plan_dict = {
+            "topic": research_plan.topic,
+            "sections": research_plan.sections[:state["max_sections"]],
+            "methodology": research_plan.methodology,
+            "estimated_length": research_plan.estimated_length
+        }
         
-        def create_plan_node(state: PlanningGraphState) -> PlanningGraphState:
-            """Create detailed research plan based on analysis"""
-            llm = Config.get_llm()
-            parser = PydanticOutputParser(pydantic_object=ResearchPlan)
-            
-            log_graph_execution("Planning", "Creating plan", f"{state['max_sections']} sections")
-            
-            # Use previous analysis for context
-            analysis_context = state["messages"][-1].content if state["messages"] else ""
-            
-            prompt = ChatPromptTemplate.from_template("""
-            Based on this topic analysis:
-            {analysis_context}
-            
-            Create a detailed research plan for: {topic}
-            
-            Requirements:
-            - Exactly {max_sections} sections
-            - Each section should focus on a specific, distinct aspect
-            - Sections should be comprehensive and non-overlapping
-            - Include appropriate research methodology
-            
-            {format_instructions}
-            """)
-            
-            formatted_prompt = prompt.format(
-                topic=state["topic"],
-                max_sections=state["max_sections"],
-                analysis_context=analysis_context,
-                format_instructions=parser.get_format_instructions()
-            )
-            
-            response = llm.invoke([HumanMessage(content=formatted_prompt)])
-            research_plan = parser.parse(response.content)
-            
-            plan_dict = {
-                "topic": research_plan.topic,
-                "sections": research_plan.sections[:state["max_sections"]],
-                "methodology": research_plan.methodology,
-                "estimated_length": research_plan.estimated_length
-            }
-            
-            return {
-                **state,
-                "research_plan": plan_dict,
-                "plan_refined": True,
-                "messages": state["messages"] + [response]
-            }
+        return {
+            "analysis": planning_output.analysis,
+            "research_plan": plan_dict,
+            "plan_refined": True,
+            "messages": [response]
+        }
+    
+    async def generate_all_queries_node(state: PlanningGraphState) -> PlanningGraphState:
+        """Generate search queries for every planned section in one LLM call"""
+        research_plan = state["research_plan"]
+        # create_plan always sets the plan before this node runs
+        assert research_plan is not None
+        sections = research_plan["sections"]
+        log_graph_execution("Planning", "Generating queries", "%d queries for %d sections", state['search_depth'], len(sections))
         
-        # Build the planning graph with checkpointing enabled
-        planning_graph = GraphBuilder.create_linear_flow(
-            PlanningGraphState,
-            [
-                ("analyze_topic", analyze_topic_node),
-                ("create_plan", create_plan_node)
-            ],
-            enable_checkpointing=True  # Enable checkpointing for state persistence
+        formatted_prompt = _GENERATE_ALL_QUERIES_PROMPT.format(
+            topic=state["topic"],
+            search_depth=state["search_depth"],
+            sections="\n".join(f"{i}. {section}" for i, section in enumerate(sections, 1)),
+            format_instructions=_QUERY_PLAN_FORMAT_INSTRUCTIONS
         )
         
-        # Create a unique thread ID for this planning session
-        thread_id = f"planning_{uuid.uuid4().hex[:8]}"
-        config = {"configurable": {"thread_id": thread_id}}
+        response = await llm.ainvoke([HumanMessage(content=formatted_prompt)])
+        try:
+            query_plan = _QUERY_PLAN_PARSER.parse(response.content)
+        except OutputParserException as e:
+            # Queries are optional: research generates its own for any
+            # section without planned queries
+            activity.logger.warning("[Planning Graph] Query generation failed, research will generate queries: %s", e)
+            query_plan = QueryPlan(sections=[])
+        
+        # Map the numbers the model echoes back to the planned titles
+        queries_by_section = {
+            sections[entry.number - 1]: [q.strip() for q in entry.queries if q.strip()][:state["search_depth"]]
+            for entry in query_plan.sections
+            if 1 <= entry.number <= len(sections)
+        }
         
-        # Execute the planning graph with checkpointing
-        log_graph_execution("Planning", "Executing planning workflow with checkpointing", f"thread_id: {thread_id}")
-        planning_result = planning_graph.invoke({
+        return {
+            "research_plan": {**research_plan, "queries_by_section": queries_by_section},
+            "messages": [response]
+        }
+    
+    return GraphBuilder.create_linear_flow(
+        PlanningGraphState,
+        [
+            ("create_plan", create_plan_node),
+            ("generate_all_queries", generate_all_queries_node)
+        ],
+        enable_checkpointing=False
+    )
+
+@activity.defn
+async def planning_activity_with_langgraph(topic: str, max_sections: int, search_depth: int = 3) -> ResearchPlanDict:
+    """Planning activity using LangGraph StateGraph"""
+    activity.logger.info("[Planning] Starting LangGraph-based planning for: %s", topic)
+    
+    try:
+        planning_graph = _build_planning_graph()
+        
+        # Execute the planning graph
+        log_graph_execution("Planning", "Executing planning workflow")
+        planning_result = await planning_graph.ainvoke({
             "topic": topic,
             "max_sections": max_sections,
+            "search_depth": search_depth,
+            "analysis": "",
             "research_plan": None,
-            "analysis_complete": False,
             "plan_refined": False,
             "messages": []
-        }, config)
-        
-        # Log checkpoint information for debugging
-        try:
-            final_state = planning_graph.get_state(config)
-            activity.logger.info(f"[Planning] Checkpoint saved with ID: {final_state.config.get('checkpoint_id', 'unknown')}")
-            activity.logger.info(f"[Planning] Final state contains {len(final_state.values.get('messages', []))} messages")
-        except Exception as e:
-            activity.logger.warning(f"[Planning] Could not retrieve checkpoint info: {e}")
+        })
         
         # Extract and return the plan
         final_plan = planning_result["research_plan"]
@@ -130,12 +167,13 @@ async def planning_activity_with_langgraph(topic: str, max_sections: int) -> Res
             topic=final_plan["topic"],
             sections=final_plan["sections"],
             methodology=final_plan["methodology"],
-            estimated_length=final_plan["estimated_length"]
+            estimated_length=final_plan["estimated_length"],
+            queries_by_section=final_plan["queries_by_section"]
         )
         
-        log_graph_execution("Planning", "Completed", f"{len(result['sections'])} sections planned")
+        log_graph_execution("Planning", "Completed", "%d sections planned", len(result['sections']))
         return result
         
     except Exception as e:
-        activity.logger.error(f"[Planning Graph] Failed: {e}")
+        activity.logger.error("[Planning Graph] Failed: %s", e)
         raise ApplicationError(f"LangGraph planning failed: {str(e)}") 
\ No newline at end of file
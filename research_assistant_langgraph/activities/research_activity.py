@@ -1,206 +1,352 @@
+import asyncio
 import re
-import uuid
+from functools import lru_cache
+from typing import Dict, List, Optional
 from temporalio import activity
 from temporalio.exceptions import ApplicationError
+from langchain_core.messages import HumanMessage
+from langchain_core.messages.ai import add_ai_message_chunks
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import RunnableLambda
+from langchain_community.tools import DuckDuckGoSearchRun
 
 from ..config import Config
-from ..schemas.types import ResearchSection, ResearchGraphState
+from ..providers import get_llm, get_search_tool
+from ..schemas.types import ResearchSection, ResearchGraphState, BatchedResearchGraphState, SectionDrafts, SearchResult
 from ..utils.graph_builder import GraphBuilder, log_graph_execution, extract_sources_from_search_results
 
-@activity.defn
-async def research_section_activity_with_langgraph(section_title: str, topic: str, search_depth: int) -> ResearchSection:
-    """Research activity using LangGraph StateGraph with checkpointing"""
-    activity.logger.info(f"[Research] Starting LangGraph-based research for: {section_title}")
+# Only this much of each result reaches the synthesis prompt, so trim
+# results once when they are stored rather than in every consumer
+_SYNTHESIS_CONTENT_LENGTH = 1500
+_STORED_CONTENT_LENGTH = min(Config.MAX_CONTENT_LENGTH, _SYNTHESIS_CONTENT_LENGTH)
+
+# An 800-1200 word section is about 1600 tokens, plus JSON escaping in the
+# batched reply. The batched call binds max_tokens for every section it
+# writes, so a batch must fit the smallest provider output limit (8192).
+_SECTION_OUTPUT_TOKENS = 2000
+_MAX_OUTPUT_TOKENS = 8192
+MAX_BATCHED_SECTIONS = _MAX_OUTPUT_TOKENS // _SECTION_OUTPUT_TOKENS
+
+# Same characters the previous alternation accepted, as a single character
+# class so the engine never backtracks between branches ("$-_" is a range
+# that already covers digits, uppercase letters and "%").
+_URL_RE = re.compile(r'https?://[a-zA-Z0-9$-_@.&+!*\\(),]+')
+
+def _duckduckgo_results(query: str, result: str) -> List[SearchResult]:
+    """Convert a DuckDuckGo text result into search result entries"""
+    # Ordered dedup keeps the first URLs seen in the result
+    unique_urls = tuple(dict.fromkeys(_URL_RE.findall(result)))[:3]
+    return [SearchResult(
+        query=query,
+        source="DuckDuckGo Search",
+        content=result[:_STORED_CONTENT_LENGTH],
+        urls=unique_urls
+    )]
+
+def _tavily_results(query: str, results: list) -> List[SearchResult]:
+    """Convert Tavily result dicts into search result entries"""
+    return [
+        SearchResult(
+            query=query,
+            source=result.get("url", "Unknown"),
+            content=result.get("content", "")[:_STORED_CONTENT_LENGTH],
+            title=result.get("title", ""),
+            urls=(result.get("url", ""),)
+        )
+        for result in results
+    ]
+
+async def _run_searches(search_tool, queries: List[str]) -> List[SearchResult]:
+    """Run every query concurrently and return the flattened search results
     
-    try:
-        # Import LangChain components inside the activity to avoid sandbox issues
-        from langchain_core.messages import HumanMessage
-        from langchain_core.prompts import ChatPromptTemplate
-        
-        def generate_queries_node(state: ResearchGraphState) -> ResearchGraphState:
-            """Generate targeted search queries"""
-            llm = Config.get_llm()
-            log_graph_execution("Research", "Generating queries", f"{state['search_depth']} queries for {state['section_title']}")
-            
-            prompt = ChatPromptTemplate.from_template("""
-            Generate {search_depth} specific, diverse search queries for researching this section:
-            
-            Section: {section_title}
-            Main Topic: {topic}
-            
-            Requirements:
-            - Queries should be specific and focused
-            - Cover different aspects of the section
-            - Use varied terminology and approaches
-            - Target different types of information sources
-            
-            Return only the queries, one per line, without numbers or bullets.
-            """)
-            
-            response = llm.invoke([HumanMessage(content=prompt.format(
-                section_title=state["section_title"],
-                topic=state["topic"],
-                search_depth=state["search_depth"]
-            ))])
-            
-            queries = [q.strip() for q in response.content.split('\n') if q.strip()]
-            queries = queries[:state["search_depth"]]
-            
-            return {
-                **state,
-                "queries": queries,
-                "queries_generated": True,
-                "messages": [response]
-            }
-        
-        def conduct_searches_node(state: ResearchGraphState) -> ResearchGraphState:
-            """Conduct web searches using generated queries"""
-            search_tool = Config.get_search_tool()
-            search_results = []
-            
-            log_graph_execution("Research", "Conducting searches", f"{len(state['queries'])} searches")
-            
-            for i, query in enumerate(state["queries"]):
-                try:
-                    activity.logger.info(f"[Research Graph] Search {i+1}/{len(state['queries'])}: {query}")
-                    
-                    if hasattr(search_tool, 'run'):
-                        # DuckDuckGo
-                        result = search_tool.run(query)
-                        urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', result)
-                        unique_urls = list(set(urls))[:3]
-                        
-                        search_results.append({
-                            "query": query,
-                            "content": result[:Config.MAX_CONTENT_LENGTH],
-                            "source": "DuckDuckGo Search",
-                            "urls": unique_urls
-                        })
-                    else:
-                        # Tavily
-                        results = search_tool.invoke({"query": query})
-                        for result in results:
-                            search_results.append({
-                                "query": query,
-                                "content": result.get("content", "")[:Config.MAX_CONTENT_LENGTH],
-                                "source": result.get("url", "Unknown"),
-                                "title": result.get("title", ""),
-                                "urls": [result.get("url", "")]
-                            })
-                
-                except Exception as e:
-                    activity.logger.warning(f"[Research Graph] Search failed for '{query}': {e}")
-                    search_results.append({
-                        "query": query,
-                        "content": f"Search failed: {str(e)}",
-                        "source": "Error",
-                        "urls": []
-                    })
-            
-            return {
-                **state,
-                "search_results": search_results,
-                "searches_completed": True
-            }
-        
-        def synthesize_content_node(state: ResearchGraphState) -> ResearchGraphState:
-            """Synthesize research findings into comprehensive content"""
-            llm = Config.get_llm()
-            
-            log_graph_execution("Research", "Synthesizing content", state['section_title'])
-            
-            # Prepare search summary
-            search_summary = "\n\n".join([
-                f"Query: {result['query']}\n"
-                f"Source: {result['source']}\n"
-                f"Content: {result['content'][:1500]}..."
-                for result in state["search_results"]
-                if result["source"] != "Error"
-            ])
-            
-            prompt = ChatPromptTemplate.from_template("""
-            Create a comprehensive, well-researched section based on the search results below.
-            
-            Section Title: {section_title}
-            Main Topic: {topic}
-            
-            SEARCH RESULTS:
-            {search_results}
-            
-            REQUIREMENTS:
-            - Write a detailed, informative section (800-1200 words)
-            - Include specific facts, statistics, and findings from the search results
-            - Use clear subsections and markdown formatting
-            - Cite specific information where possible
-            - Provide objective analysis based on the evidence
-            - Include concrete examples and case studies if mentioned in sources
-            
-            STRUCTURE:
-            - Brief introduction to the section topic
-            - 2-3 detailed subsections covering different aspects
-            - Key findings and implications
-            - Specific data points and evidence from research
-            
-            DO NOT use generic phrases like "research indicates" without specific details.
-            DO include actual facts, numbers, and specific findings from the sources.
-            """)
-            
-            response = llm.invoke([HumanMessage(content=prompt.format(
-                section_title=state["section_title"],
-                topic=state["topic"],
-                search_results=search_summary
-            ))])
-            
-            # Extract sources using utility function
-            unique_sources = extract_sources_from_search_results(state["search_results"])
+    Failed searches are kept as "Error" entries so callers can report them.
+    """
+    total = len(queries)
+    # Shared with every other search in this worker; None when unlimited
+    rate_limiter = Config.get_search_rate_limiter()
+    
+    if isinstance(search_tool, DuckDuckGoSearchRun):
+        # Cap in-flight searches to stay under provider rate limits
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_SEARCHES)
+        
+        async def _one_search(i: int, query: str) -> list:
+            async with semaphore:
+                if rate_limiter is not None:
+                    await rate_limiter.acquire()
+                activity.logger.info("[Research Graph] Search %d/%d: %s", i + 1, total, query)
+                # DuckDuckGo has a sync API only, so run it in a worker
+                # thread to keep the event loop free
+                result = await asyncio.to_thread(search_tool.run, query)
+            return _duckduckgo_results(query, result)
+        
+        outcomes = await asyncio.gather(
+            *[_one_search(i, query) for i, query in enumerate(queries)],
+            return_exceptions=True
+        )
+    else:
+        # Tavily: hand every query to one abatch call, which runs them on
+        # the tool's native async client with bounded concurrency
+        runnable = search_tool
+        if rate_limiter is not None:
+            async def _limited_search(tool_input: dict):
+                await rate_limiter.acquire()
+                return await search_tool.ainvoke(tool_input)
             
-            return {
-                **state,
-                "section_content": response.content,
-                "sources": unique_sources,
-                "content_synthesized": True,
-                "messages": state["messages"] + [response]
-            }
-        
-        # Build the research graph with checkpointing enabled
-        research_graph = GraphBuilder.create_linear_flow(
-            ResearchGraphState,
-            [
-                ("generate_queries", generate_queries_node),
-                ("conduct_searches", conduct_searches_node),
-                ("synthesize_content", synthesize_content_node)
-            ],
-            enable_checkpointing=True  # Enable checkpointing for state persistence
+            # One coroutine per query, so each takes a token just before its
+            # own request (a search_tool sequence would take every token first)
+            runnable = RunnableLambda(_limited_search)
+        raw_outcomes = await runnable.abatch(
+            [{"query": query} for query in queries],
+            config={"max_concurrency": Config.MAX_CONCURRENT_SEARCHES},
+            return_exceptions=True
         )
+        outcomes = []
+        for query, raw in zip(queries, raw_outcomes):
+            try:
+                outcomes.append(raw if isinstance(raw, Exception) else _tavily_results(query, raw))
+            except Exception as e:
+                # Tavily reports some failures as a plain string result
+                outcomes.append(e)
+    
+    search_results = []
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, BaseException):
+            activity.logger.warning("[Research Graph] Search failed for '%s': %s", query, outcome)
+            search_results.append(SearchResult(
+                query=query,
+                source="Error",
+                content=f"Search failed: {str(outcome)}"
+            ))
+        else:
+            search_results.extend(outcome)
+    
+    return search_results
+
+def _results_by_section(
+    section_titles: List[str],
+    queries_by_section: Dict[str, List[str]],
+    search_results: List[SearchResult]
+) -> List[List[SearchResult]]:
+    """Group search results under each section's queries, in section order"""
+    results_by_query: Dict[str, List[SearchResult]] = {}
+    for result in search_results:
+        results_by_query.setdefault(result.query, []).append(result)
+    return [
+        [result for query in queries_by_section.get(section_title, []) for result in results_by_query.get(query, [])]
+        for section_title in section_titles
+    ]
+
+def _format_search_summary(ok_results: List[SearchResult]) -> str:
+    """Format successful search results for a synthesis prompt"""
+    # Content was trimmed when stored
+    return "\n\n".join(
+        f"Query: {result.query}\n"
+        f"Source: {result.source}\n"
+        f"Content: {result.content}..."
+        for result in ok_results
+    )
+
+_GENERATE_QUERIES_PROMPT = ChatPromptTemplate.from_template("""
+    Generate {search_depth} specific, diverse search queries for researching this section:
+    
+    Section: {section_title}
+    Main Topic: {topic}
+    
+    Requirements:
+    - Queries should be specific and focused
+    - Cover different aspects of the section
+    - Use varied terminology and approaches
+    - Target different types of information sources
+    
+    Return only the queries, one per line, without numbers or bullets.
+    """)
+
+_SYNTHESIZE_CONTENT_PROMPT = ChatPromptTemplate.from_template("""
+    Create a comprehensive, well-researched section based on the search results below.
+    
+    Section Title: {section_title}
+    Main Topic: {topic}
+    
+    SEARCH RESULTS:
+    {search_results}
+    
+    REQUIREMENTS:
+    - Write a detailed, informative section (800-1200 words)
+    - Include specific facts, statistics, and findings from the search results
+    - Use clear subsections and markdown formatting
+    - Cite specific information where possible
+    - Provide objective analysis based on the evidence
+    - Include concrete examples and case studies if mentioned in sources
+    
+    STRUCTURE:
+    - Brief introduction to the section topic
+    - 2-3 detailed subsections covering different aspects
+    - Key findings and implications
+    - Specific data points and evidence from research
+    
+    DO NOT use generic phrases like "research indicates" without specific details.
+    DO include actual facts, numbers, and specific findings from the sources.
+    """)
+
+_SYNTHESIZE_SECTIONS_PROMPT = ChatPromptTemplate.from_template("""
+    Create a comprehensive, well-researched section for each numbered section
+    below, based on that section's search results.
+    
+    Main Topic: {topic}
+    
+    {sections}
+    
+    REQUIREMENTS (for every section):
+    - Write a detailed, informative section (800-1200 words)
+    - Include specific facts, statistics, and findings from its search results
+    - Use clear subsections and markdown formatting
+    - Cite specific information where possible
+    - Provide objective analysis based on the evidence
+    - Include concrete examples and case studies if mentioned in sources
+    
+    STRUCTURE (for every section):
+    - Brief introduction to the section topic
+    - 2-3 detailed subsections covering different aspects
+    - Key findings and implications
+    - Specific data points and evidence from research
+    
+    DO NOT use generic phrases like "research indicates" without specific details.
+    DO include actual facts, numbers, and specific findings from the sources.
+    
+    Return exactly one draft per section, numbered as in the list above.
+    
+    {format_instructions}
+    """)
+
+_SECTION_DRAFTS_PARSER = PydanticOutputParser(pydantic_object=SectionDrafts)
+_SECTION_DRAFTS_FORMAT_INSTRUCTIONS = _SECTION_DRAFTS_PARSER.get_format_instructions()
+
+async def _generate_queries(llm, section_title: str, topic: str, search_depth: int):
+    """Generate up to search_depth queries for one section; returns (queries, response)"""
+    response = await llm.ainvoke([HumanMessage(content=_GENERATE_QUERIES_PROMPT.format(
+        section_title=section_title,
+        topic=topic,
+        search_depth=search_depth
+    ))])
+    
+    queries = [q.strip() for q in response.content.split('\n') if q.strip()]
+    return queries[:search_depth], response
+
+@lru_cache(maxsize=1)
+def _build_research_graph():
+    """Compile the research graph once; every activity call reuses it"""
+    llm = get_llm()
+    search_tool = get_search_tool()
+    
+    async def generate_queries_node(state: ResearchGraphState) -> ResearchGraphState:
+        """Generate targeted search queries"""
+        if state["queries_generated"]:
+            # Queries were batched for all sections at planning time
+            return {}
+        
+        log_graph_execution("Research", "Generating queries", "%d queries for %s", state['search_depth'], state['section_title'])
+        
+        queries, response = await _generate_queries(llm, state["section_title"], state["topic"], state["search_depth"])
+        
+        return {
+            "queries": queries,
+            "queries_generated": True,
+            "messages": [response]
+        }
+    
+    async def conduct_searches_node(state: ResearchGraphState) -> ResearchGraphState:
+        """Conduct web searches concurrently using generated queries"""
+        if state["searches_completed"]:
+            # Searched by a failed batched run for this section
+            return {}
+        
+        log_graph_execution("Research", "Conducting searches", "%d searches", len(state["queries"]))
+        
+        search_results = await _run_searches(search_tool, state["queries"])
+        
+        return {
+            "search_results": search_results,
+            "searches_completed": True
+        }
+    
+    async def synthesize_content_node(state: ResearchGraphState) -> ResearchGraphState:
+        """Synthesize research findings into comprehensive content"""
+        log_graph_execution("Research", "Synthesizing content", state['section_title'])
         
-        # Create a unique thread ID for this research session
-        thread_id = f"research_{section_title.lower().replace(' ', '_')}_{uuid.uuid4().hex[:8]}"
-        config = {"configurable": {"thread_id": thread_id}}
+        # Drop failed searches once for both the prompt and source extraction
+        ok_results = [result for result in state["search_results"] if result.source != "Error"]
         
-        # Execute the research graph with checkpointing
-        log_graph_execution("Research", "Executing research workflow with checkpointing", f"thread_id: {thread_id}")
-        research_result = research_graph.invoke({
+        search_summary = _format_search_summary(ok_results)
+        
+        # Stream the long synthesis reply so the event loop can service other
+        # concurrent research activities between chunks
+        chunks = []
+        async for chunk in llm.astream([HumanMessage(content=_SYNTHESIZE_CONTENT_PROMPT.format(
+            section_title=state["section_title"],
+            topic=state["topic"],
+            search_results=search_summary
+        ))]):
+            chunks.append(chunk)
+        
+        if not chunks:
+            raise ValueError("LLM returned an empty response stream")
+        response = add_ai_message_chunks(chunks[0], *chunks[1:])
+        
+        # Extract sources using utility function
+        unique_sources = extract_sources_from_search_results(ok_results)
+        
+        return {
+            "section_content": response.content,
+            "sources": unique_sources,
+            "content_synthesized": True,
+            "messages": [response]
+        }
+    
+    # Build the research graph
+    return GraphBuilder.create_linear_flow(
+        ResearchGraphState,
+        [
+            ("generate_queries", generate_queries_node),
+            ("conduct_searches", conduct_searches_node),
+            ("synthesize_content", synthesize_content_node)
+        ],
+        enable_checkpointing=False
+    )
+
+@activity.defn
+async def research_section_activity_with_langgraph(
+    section_title: str,
+    topic: str,
+    search_depth: int,
+    queries: Optional[List[str]] = None,
+    search_results: Optional[List[SearchResult]] = None
+) -> ResearchSection:
+    """Research activity using LangGraph StateGraph
+    
+    Passing search_results (with the queries that produced them) skips
+    straight to synthesis.
+    """
+    activity.logger.info("[Research] Starting LangGraph-based research for: %s", section_title)
+    
+    try:
+        research_graph = _build_research_graph()
+        
+        # Execute the research graph
+        log_graph_execution("Research", "Executing research workflow")
+        research_result = await research_graph.ainvoke({
             "section_title": section_title,
             "topic": topic,
             "search_depth": search_depth,
-            "queries": [],
-            "search_results": [],
+            "queries": queries or [],
+            "search_results": search_results or [],
             "section_content": "",
             "sources": [],
-            "queries_generated": False,
-            "searches_completed": False,
+            "queries_generated": bool(queries) or search_results is not None,
+            "searches_completed": search_results is not None,
             "content_synthesized": False,
             "messages": []
-        }, config)
-        
-        # Log checkpoint information for debugging
-        try:
-            final_state = research_graph.get_state(config)
-            activity.logger.info(f"[Research] Checkpoint saved with ID: {final_state.config.get('checkpoint_id', 'unknown')}")
-            activity.logger.info(f"[Research] Final state contains {len(final_state.values.get('messages', []))} messages")
-            activity.logger.info(f"[Research] Searches completed: {final_state.values.get('searches_completed', False)}")
-        except Exception as e:
-            activity.logger.warning(f"[Research] Could not retrieve checkpoint info: {e}")
+        })
         
         # Create final section
         section = ResearchSection(
@@ -210,14 +356,168 @@ async def research_section_activity_with_langgraph(section_title: str, topic: st
             queries_used=research_result["queries"]
         )
         
-        log_graph_execution("Research", "Completed", f"{section_title}: {len(section['content'])} chars, {len(section['sources'])} sources")
+        log_graph_execution("Research", "Completed", "%s: %d chars, %d sources", section_title, len(section['content']), len(section['sources']))
         return section
         
     except Exception as e:
-        activity.logger.error(f"[Research Graph] Failed for {section_title}: {e}")
+        activity.logger.error("[Research Graph] Failed for %s: %s", section_title, e)
         return ResearchSection(
             title=section_title,
             content=f"Research for this section encountered an error: {str(e)}",
             sources=["Error in research process"],
             queries_used=[]
-        ) 
\ No newline at end of file
+        ) 
+
+@lru_cache(maxsize=1)
+def _build_batched_research_graph():
+    """Compile the batched research graph once; every activity call reuses it"""
+    llm = get_llm()
+    search_tool = get_search_tool()
+    
+    async def generate_missing_queries_node(state: BatchedResearchGraphState) -> BatchedResearchGraphState:
+        """Generate queries for sections planning left without any"""
+        missing = [title for title in state["section_titles"] if not state["queries_by_section"].get(title)]
+        if not missing:
+            return {}
+        
+        log_graph_execution("Research", "Generating queries", "%d queries for %d sections", state['search_depth'], len(missing))
+        
+        # Same per-section prompt as the single-section graph, run concurrently
+        generated = await asyncio.gather(*[
+            _generate_queries(llm, section_title, state["topic"], state["search_depth"])
+            for section_title in missing
+        ])
+        
+        queries_by_section = dict(state["queries_by_section"])
+        for section_title, (queries, _) in zip(missing, generated):
+            queries_by_section[section_title] = queries
+        
+        return {
+            "queries_by_section": queries_by_section,
+            "messages": [response for _, response in generated]
+        }
+    
+    async def conduct_all_searches_node(state: BatchedResearchGraphState) -> BatchedResearchGraphState:
+        """Conduct the searches of every section concurrently"""
+        # Sections may share queries, so search each one only once
+        queries = list(dict.fromkeys(
+            query
+            for section_title in state["section_titles"]
+            for query in state["queries_by_section"].get(section_title, [])
+        ))
+        log_graph_execution("Research", "Conducting searches", "%d searches for %d sections", len(queries), len(state["section_titles"]))
+        
+        search_results = await _run_searches(search_tool, queries)
+        
+        return {
+            "search_results": search_results,
+            "searches_completed": True
+        }
+    
+    async def synthesize_all_sections_node(state: BatchedResearchGraphState) -> BatchedResearchGraphState:
+        """Synthesize every section in a single LLM call"""
+        section_titles = state["section_titles"]
+        log_graph_execution("Research", "Synthesizing content", "%d sections", len(section_titles))
+        
+        section_queries = [state["queries_by_section"].get(section_title, []) for section_title in section_titles]
+        ok_results = [result for result in state["search_results"] if result.source != "Error"]
+        section_results = _results_by_section(section_titles, state["queries_by_section"], ok_results)
+        
+        sections_block = "\n\n".join(
+            f"SECTION {i}: {section_title}\nSEARCH RESULTS:\n{_format_search_summary(results)}"
+            for i, (section_title, results) in enumerate(zip(section_titles, section_results), 1)
+        )
+        
+        # Provider defaults (4096 for Anthropic) would truncate the reply
+        batched_llm = llm.bind(max_tokens=len(section_titles) * _SECTION_OUTPUT_TOKENS)
+        response = await batched_llm.ainvoke([HumanMessage(content=_SYNTHESIZE_SECTIONS_PROMPT.format(
+            topic=state["topic"],
+            sections=sections_block,
+            format_instructions=_SECTION_DRAFTS_FORMAT_INSTRUCTIONS
+        ))])
+        drafts = _SECTION_DRAFTS_PARSER.parse(response.content)
+        
+        content_by_number = {draft.number: draft.content for draft in drafts.sections}
+        missing = [i for i in range(1, len(section_titles) + 1) if i not in content_by_number]
+        if missing:
+            raise ValueError(f"LLM returned no draft for sections {missing}")
+        
+        sections = [
+            ResearchSection(
+                title=section_title,
+                content=content_by_number[i],
+                sources=extract_sources_from_search_results(results),
+                queries_used=queries
+            )
+            for i, (section_title, queries, results) in enumerate(
+                zip(section_titles, section_queries, section_results), 1
+            )
+        ]
+        
+        return {
+            "sections": sections,
+            "content_synthesized": True,
+            "messages": [response]
+        }
+    
+    return GraphBuilder.create_linear_flow(
+        BatchedResearchGraphState,
+        [
+            ("generate_missing_queries", generate_missing_queries_node),
+            ("conduct_all_searches", conduct_all_searches_node),
+            ("synthesize_all_sections", synthesize_all_sections_node)
+        ],
+        enable_checkpointing=False
+    )
+
+@activity.defn
+async def research_sections_batched_activity_with_langgraph(
+    section_titles: List[str],
+    topic: str,
+    search_depth: int,
+    queries_by_section: Dict[str, List[str]]
+) -> List[ResearchSection]:
+    """Research up to MAX_BATCHED_SECTIONS sections with one shared synthesis LLM call
+    
+    Raises ApplicationError on failure so the workflow can fall back to
+    researching each section on its own. If the searches finished, the
+    error details carry {"queries_by_section": ..., "search_results_by_section": ...}
+    so the fallback only has to redo synthesis.
+    """
+    activity.logger.info("[Research] Starting batched LangGraph research for %d sections", len(section_titles))
+    
+    research_result: BatchedResearchGraphState = {
+        "topic": topic,
+        "section_titles": section_titles,
+        "search_depth": search_depth,
+        "queries_by_section": queries_by_section,
+        "search_results": [],
+        "sections": [],
+        "searches_completed": False,
+        "content_synthesized": False,
+        "messages": []
+    }
+    try:
+        batched_graph = _build_batched_research_graph()
+        
+        log_graph_execution("Research", "Executing batched research workflow")
+        # Stream state values so a failed run still exposes its last state
+        async for research_result in batched_graph.astream(research_result, stream_mode="values"):
+            pass
+        
+        sections = research_result["sections"]
+        log_graph_execution("Research", "Completed", "%d sections, %d chars", len(sections), sum(len(section['content']) for section in sections))
+        return sections
+        
+    except Exception as e:
+        activity.logger.error("[Research Graph] Batched research failed: %s", e)
+        details = []
+        if research_result["searches_completed"]:
+            results_by_section = _results_by_section(
+                section_titles, research_result["queries_by_section"], research_result["search_results"]
+            )
+            details.append({
+                "queries_by_section": research_result["queries_by_section"],
+                "search_results_by_section": dict(zip(section_titles, results_by_section))
+            })
+        raise ApplicationError(f"LangGraph batched research failed: {str(e)}", *details)
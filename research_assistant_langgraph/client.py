@@ -1,14 +1,49 @@
 import asyncio
+import io
+import sys
 import uuid
+from typing import Optional
 from temporalio.client import Client
+from temporalio.service import KeepAliveConfig
 
 from .config import Config
 from .workflow import ResearchAssistantWorkflow
 from .schemas.types import ResearchState
 
+# One connection per process, shared by every workflow start
+_client_singleton: Optional[Client] = None
+_client_lock = asyncio.Lock()
+
+async def get_client() -> Client:
+    """Return the process-wide Temporal client, connecting on first use"""
+    global _client_singleton
+    if _client_singleton is None:
+        async with _client_lock:
+            if _client_singleton is None:
+                _client_singleton = await Client.connect(
+                    Config.TEMPORAL_HOST,
+                    # Keep the gRPC channel warm between workflow starts
+                    keep_alive_config=KeepAliveConfig()
+                )
+    return _client_singleton
+
+_REPORT_WRITE_CHUNK = 1 << 20  # 1 MiB
+
+def _write_report(filename: str, report: str) -> None:
+    """Write the report in bounded chunks"""
+    with open(filename, "w", buffering=_REPORT_WRITE_CHUNK) as f:
+        for i in range(0, len(report), _REPORT_WRITE_CHUNK):
+            f.write(report[i:i + _REPORT_WRITE_CHUNK])
+
+def _write_output(out: io.StringIO) -> None:
+    """Write buffered output to stdout with a single write"""
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+
 async def start_research_workflow(topic: str, max_sections: int = 5, search_depth: int = 3) -> ResearchState:
     """Start LangGraph-enabled research workflow"""
-    client = await Client.connect(Config.TEMPORAL_HOST)
+    client = await get_client()
+    slug = topic.lower()
     
     print(f"🔬 Starting LangGraph Research for: '{topic}'")
     print(f"📊 Configuration: {max_sections} sections, search depth {search_depth}")
@@ -20,41 +55,45 @@ async def start_research_workflow(topic: str, max_sections: int = 5, search_dept
         result: ResearchState = await client.execute_workflow(
             ResearchAssistantWorkflow.run,
             args=[topic, max_sections, search_depth],
-            id=f"langgraph-research-{topic.replace(' ', '-').lower()}-{uuid.uuid4()}",
+            id=f"langgraph-research-{slug.replace(' ', '-')}-{uuid.uuid4()}",
             task_queue=Config.RESEARCH_TASK_QUEUE,
         )
         
-        print("\n" + "="*80)
-        print("🎉 LANGGRAPH RESEARCH COMPLETED!")
-        print("="*80)
+        # Collect the summary and write it to stdout in one call
+        out = io.StringIO()
+        print("\n" + "="*80, file=out)
+        print("🎉 LANGGRAPH RESEARCH COMPLETED!", file=out)
+        print("="*80, file=out)
         
         if result.get("error_message"):
-            print(f"❌ Error: {result['error_message']}")
+            print(f"❌ Error: {result['error_message']}", file=out)
+            _write_output(out)
             return result
             
-        print(f"📝 Topic: {result['research_topic']}")
-        print(f"📈 Phase: {result['current_phase']}")
+        print(f"📝 Topic: {result['research_topic']}", file=out)
+        print(f"📈 Phase: {result['current_phase']}", file=out)
         
         if result.get("research_plan"):
             plan = result["research_plan"]
-            print(f"\n📋 Plan: {len(plan['sections'])} sections")
+            print(f"\n📋 Plan: {len(plan['sections'])} sections", file=out)
             for i, section in enumerate(plan["sections"], 1):
-                print(f"   {i}. {section}")
+                print(f"   {i}. {section}", file=out)
         
-        print(f"\n📚 Completed: {len(result.get('completed_sections', []))} sections")
+        print(f"\n📚 Completed: {len(result.get('completed_sections', []))} sections", file=out)
         
         if result.get("report_metadata"):
             meta = result["report_metadata"]
-            print(f"\n📊 Statistics:")
-            print(f"   Word Count: {meta.get('word_count', 0):,}")
-            print(f"   Total Sources: {meta.get('total_sources', 0)}")
-            print(f"   Total Queries: {meta.get('total_queries', 0)}")
+            print(f"\n📊 Statistics:", file=out)
+            print(f"   Word Count: {meta.get('word_count', 0):,}", file=out)
+            print(f"   Total Sources: {meta.get('total_sources', 0)}", file=out)
+            print(f"   Total Queries: {meta.get('total_queries', 0)}", file=out)
+        
+        _write_output(out)
         
         # Save report
         if result.get("final_report"):
-            filename = f"langgraph_research_report_{topic.replace(' ', '_').lower()}.md"
-            with open(filename, "w") as f:
-                f.write(result["final_report"])
+            filename = f"langgraph_research_report_{slug.replace(' ', '_')}.md"
+            await asyncio.to_thread(_write_report, filename, result["final_report"])
             print(f"💾 LangGraph report saved to: {filename}")
         
         return result
@@ -65,8 +104,6 @@ async def start_research_workflow(topic: str, max_sections: int = 5, search_dept
 
 async def main() -> None:
     """Main function for command line usage"""
-    import sys
-    
     if len(sys.argv) < 2:
         print("LangGraph Research Assistant Usage:")
         print("  python -m research_assistant_langgraph.client \"<topic>\" [max_sections] [search_depth]")
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load environment variables at module level
@@ -13,11 +14,18 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
     
+    # Exact-match LLM response cache, off unless a path is set. A cached reply
+    # that fails to parse is replayed on every retry, so those retries fail too
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+    
     # Search Configuration
     DEFAULT_SEARCH_PROVIDER = os.getenv("DEFAULT_SEARCH_PROVIDER", "duckduckgo")
     TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
     MAX_SEARCH_RESULTS = int(os.getenv("MAX_SEARCH_RESULTS", "5"))
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", "2000"))
+    MAX_CONCURRENT_SEARCHES = int(os.getenv("MAX_CONCURRENT_SEARCHES", "4"))
+    # Searches per minute across all activities in a worker (0 disables the limit)
+    SEARCH_RPM = int(os.getenv("SEARCH_RPM", "0"))
     
     # Temporal Configuration
     TEMPORAL_HOST = os.getenv("TEMPORAL_HOST", "localhost:7233")
@@ -25,37 +33,47 @@ class Config:
     
     @classmethod
     def get_llm(cls):
-        """Get configured LLM instance"""
+        """Get configured LLM instance (cached per worker process)"""
+        # providers imports Config, so import it here to avoid a cycle
+        from .providers import get_llm
+        return get_llm()
+    
+    @classmethod
+    def configure_llm_cache(cls) -> bool:
+        """Install a process-wide SQLite cache for LLM responses
+        
+        Repeated prompts return the stored response instead of calling the
+        provider. Returns whether a cache was installed.
+        """
+        if not cls.LLM_CACHE_PATH:
+            return False
+        
         # Import inside method to avoid Temporal sandbox issues
-        from langchain_openai import ChatOpenAI
-        from langchain_anthropic import ChatAnthropic
+        from langchain_core.globals import set_llm_cache
+        from langchain_community.cache import SQLiteCache
         
-        if cls.ANTHROPIC_API_KEY and cls.DEFAULT_LLM_PROVIDER == "anthropic":
-            return ChatAnthropic(
-                model="claude-3-5-sonnet-20241022", 
-                api_key=cls.ANTHROPIC_API_KEY, 
-                temperature=0.1
-            )
-        elif cls.OPENAI_API_KEY:
-            return ChatOpenAI(
-                model=cls.DEFAULT_LLM_MODEL, 
-                api_key=cls.OPENAI_API_KEY, 
-                temperature=0.1
-            )
-        else:
-            raise ValueError("No LLM API keys configured!")
+        set_llm_cache(SQLiteCache(database_path=cls.LLM_CACHE_PATH))
+        return True
     
     @classmethod
     def get_search_tool(cls):
-        """Get configured search tool"""
-        # Import inside method to avoid Temporal sandbox issues
-        from langchain_community.tools.tavily_search import TavilySearchResults
-        from langchain_community.tools import DuckDuckGoSearchRun
-        
-        if cls.DEFAULT_SEARCH_PROVIDER == "tavily" and cls.TAVILY_API_KEY:
-            return TavilySearchResults(
-                api_key=cls.TAVILY_API_KEY, 
-                max_results=cls.MAX_SEARCH_RESULTS
-            )
-        else:
-            return DuckDuckGoSearchRun() 
\ No newline at end of file
+        """Get configured search tool (cached per worker process)"""
+        # providers imports Config, so import it here to avoid a cycle
+        from .providers import get_search_tool
+        return get_search_tool()
+    
+    @classmethod
+    def get_search_rate_limiter(cls):
+        """Get the worker-wide search token bucket, or None when unlimited"""
+        return _build_search_rate_limiter(cls.SEARCH_RPM)
+
+@lru_cache(maxsize=1)
+def _build_search_rate_limiter(search_rpm: int):
+    """Build one token bucket shared by every search in this worker process"""
+    if search_rpm <= 0:
+        return None
+    
+    from .utils.rate_limit import TokenBucket
+    
+    # Capacity 1: no burst, so no minute ever exceeds SEARCH_RPM searches
+    return TokenBucket(search_rpm)
@@ -0,0 +1,81 @@
+"""LLM and search tool factories
+
+Each provider SDK is imported by its factory on first use, so importing
+this module (and the activity and workflow modules that import it, as the
+client CLI does) stays cheap and only the configured SDK is ever loaded.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, TYPE_CHECKING
+
+from .config import Config
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.tools import BaseTool
+
+# Each factory builds its client once per worker process, and activity
+# graphs share it across all of their nodes, so HTTP connection pools are
+# reused by every activity call
+
+@lru_cache(maxsize=1)
+def _make_openai() -> "BaseChatModel":
+    from langchain_openai import ChatOpenAI
+    
+    # No http_async_client: langchain_openai already shares one default
+    # client per process, sized with the OpenAI SDK's connection limits
+    return ChatOpenAI(
+        model=Config.DEFAULT_LLM_MODEL, 
+        api_key=Config.OPENAI_API_KEY, 
+        temperature=0.1
+    )
+
+@lru_cache(maxsize=1)
+def _make_anthropic() -> "BaseChatModel":
+    from langchain_anthropic import ChatAnthropic
+    
+    return ChatAnthropic(
+        model="claude-3-5-sonnet-20241022", 
+        api_key=Config.ANTHROPIC_API_KEY, 
+        temperature=0.1
+    )
+
+@lru_cache(maxsize=1)
+def _make_duckduckgo() -> "BaseTool":
+    from langchain_community.tools import DuckDuckGoSearchRun
+    
+    return DuckDuckGoSearchRun()
+
+@lru_cache(maxsize=1)
+def _make_tavily() -> "BaseTool":
+    from langchain_community.tools.tavily_search import TavilySearchResults
+    
+    return TavilySearchResults(
+        api_key=Config.TAVILY_API_KEY, 
+        max_results=Config.MAX_SEARCH_RESULTS
+    )
+
+LLM_FACTORIES: Dict[str, Callable[[], "BaseChatModel"]] = {
+    "openai": _make_openai,
+    "anthropic": _make_anthropic,
+}
+
+SEARCH_TOOL_FACTORIES: Dict[str, Callable[[], "BaseTool"]] = {
+    "duckduckgo": _make_duckduckgo,
+    "tavily": _make_tavily,
+}
+
+def get_llm() -> "BaseChatModel":
+    """Get the configured LLM, falling back to OpenAI when Anthropic is not usable"""
+    if Config.DEFAULT_LLM_PROVIDER == "anthropic" and Config.ANTHROPIC_API_KEY:
+        return LLM_FACTORIES["anthropic"]()
+    elif Config.OPENAI_API_KEY:
+        return LLM_FACTORIES["openai"]()
+    else:
+        raise ValueError("No LLM API keys configured!")
+
+def get_search_tool() -> "BaseTool":
+    """Get the configured search tool, falling back to DuckDuckGo"""
+    if Config.DEFAULT_SEARCH_PROVIDER == "tavily" and Config.TAVILY_API_KEY:
+        return SEARCH_TOOL_FACTORIES["tavily"]()
+    return SEARCH_TOOL_FACTORIES["duckduckgo"]()
@@ -4,18 +4,32 @@ from .types import (
     ResearchSection,
     ResearchPlanDict,
     ResearchState,
+    SearchResult,
     PlanningGraphState,
     ResearchGraphState,
+    BatchedResearchGraphState,
     ReportGraphState,
     ResearchPlan,
+    PlanningOutput,
+    SectionQueries,
+    QueryPlan,
+    SectionDraft,
+    SectionDrafts,
 )
 
 __all__ = [
     "ResearchSection",
     "ResearchPlanDict", 
     "ResearchState",
+    "SearchResult",
     "PlanningGraphState",
     "ResearchGraphState",
+    "BatchedResearchGraphState",
     "ReportGraphState",
     "ResearchPlan",
+    "PlanningOutput",
+    "SectionQueries",
+    "QueryPlan",
+    "SectionDraft",
+    "SectionDrafts",
 ] 
\ No newline at end of file
@@ -1,6 +1,9 @@
-from typing import TypedDict, Annotated, List, Dict, Any, Optional, Literal
+from dataclasses import dataclass
+from typing import TypedDict, Annotated, List, Dict, Any, Optional, Literal, Tuple
 import operator
 from pydantic import BaseModel, Field
+from langchain_core.messages import BaseMessage
+from langgraph.graph.message import add_messages
 
 # Temporal State schemas
 class ResearchSection(TypedDict):
@@ -14,6 +17,7 @@ class ResearchPlanDict(TypedDict):
     sections: List[str]
     methodology: str
     estimated_length: int
+    queries_by_section: Dict[str, List[str]]
 
 class ResearchState(TypedDict):
     research_topic: str
@@ -28,31 +32,54 @@ class ResearchState(TypedDict):
     current_phase: Literal["planning", "research", "writing", "complete"]
     error_message: str
 
-# LangGraph State schemas
-class PlanningGraphState(TypedDict):
+# Search results only live inside the research activity, so they use a
+# slotted dataclass for cheap attribute access instead of dict lookups
+@dataclass(slots=True)
+class SearchResult:
+    query: str
+    source: str
+    content: str
+    title: str = ""
+    urls: Tuple[str, ...] = ()
+
+# LangGraph State schemas (total=False: nodes return only the keys they update)
+class PlanningGraphState(TypedDict, total=False):
     topic: str
     max_sections: int
+    search_depth: int
+    analysis: str
     research_plan: Optional[Dict[str, Any]]
-    analysis_complete: bool
     plan_refined: bool
-    messages: Annotated[List, operator.add]
+    messages: Annotated[List[BaseMessage], add_messages]
 
-class ResearchGraphState(TypedDict):
+class ResearchGraphState(TypedDict, total=False):
     section_title: str
     topic: str
     search_depth: int
     queries: List[str]
-    search_results: List[Dict[str, Any]]
+    search_results: List[SearchResult]
     section_content: str
     sources: List[str]
     queries_generated: bool
     searches_completed: bool
     content_synthesized: bool
-    messages: Annotated[List, operator.add]
+    messages: Annotated[List[BaseMessage], add_messages]
+
+class BatchedResearchGraphState(TypedDict, total=False):
+    topic: str
+    section_titles: List[str]
+    search_depth: int
+    queries_by_section: Dict[str, List[str]]
+    search_results: List[SearchResult]
+    sections: List[ResearchSection]
+    searches_completed: bool
+    content_synthesized: bool
+    messages: Annotated[List[BaseMessage], add_messages]
 
-class ReportGraphState(TypedDict):
+class ReportGraphState(TypedDict, total=False):
     research_plan: ResearchPlanDict
     sections: List[ResearchSection]
+    section_previews: List[Tuple[str, str, str]]  # (title, short, medium) content previews
     executive_summary: str
     main_content: str
     conclusion: str
@@ -63,11 +90,29 @@ class ReportGraphState(TypedDict):
     conclusion_written: bool
     sources_compiled: bool
     report_finalized: bool
-    messages: Annotated[List, operator.add]
+    messages: Annotated[List[BaseMessage], add_messages]
 
 # Pydantic models
 class ResearchPlan(BaseModel):
     topic: str = Field(description="The research topic")
     sections: List[str] = Field(description="List of section titles")
     methodology: str = Field(description="Research methodology")
-    estimated_length: int = Field(description="Estimated word count") 
\ No newline at end of file
+    estimated_length: int = Field(description="Estimated word count")
+
+class PlanningOutput(BaseModel):
+    analysis: str = Field(description="Analysis of the research scope and approach")
+    plan: ResearchPlan = Field(description="The research plan")
+
+class SectionQueries(BaseModel):
+    number: int = Field(description="Section number, as given in the section list")
+    queries: List[str] = Field(description="Search queries for this section")
+
+class QueryPlan(BaseModel):
+    sections: List[SectionQueries] = Field(description="Search queries for each section")
+
+class SectionDraft(BaseModel):
+    number: int = Field(description="Section number, as given in the section list")
+    content: str = Field(description="Markdown content of the section")
+
+class SectionDrafts(BaseModel):
+    sections: List[SectionDraft] = Field(description="One draft per section, in section-list order")
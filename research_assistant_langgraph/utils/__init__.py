@@ -6,10 +6,14 @@ from .graph_builder import (
     create_message_summary,
     extract_sources_from_search_results,
 )
+from .checkpointers import DeferredSaver, FlushOnReturnGraph, LocalMemorySaver
 
 __all__ = [
     "GraphBuilder",
     "log_graph_execution", 
     "create_message_summary",
     "extract_sources_from_search_results",
+    "DeferredSaver",
+    "FlushOnReturnGraph",
+    "LocalMemorySaver",
 ] 
\ No newline at end of file
@@ -0,0 +1,400 @@
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    copy_checkpoint,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+CheckpointKey = Tuple[str, str]  # (thread_id, checkpoint_ns)
+
+def _checkpoint_key(config: RunnableConfig) -> CheckpointKey:
+    configurable = config["configurable"]
+    return configurable["thread_id"], configurable.get("checkpoint_ns", "")
+
+class LocalMemorySaver(BaseCheckpointSaver):
+    """In-process checkpointer that keeps checkpoints as live objects
+    
+    Unlike InMemorySaver, nothing is passed through the serializer: put
+    stores the checkpoint dict as-is. Reads return a shallow copy, since
+    LangGraph updates channel_versions and versions_seen of the checkpoint
+    it resumes from. Channel values are still shared, so this is only
+    suitable for graphs whose state never leaves the process and whose
+    nodes return new values instead of mutating state in place.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        # (thread_id, checkpoint_ns) -> checkpoint_id -> (checkpoint, metadata, parent_checkpoint_id)
+        self.storage: Dict[CheckpointKey, Dict[str, Tuple[Checkpoint, CheckpointMetadata, Optional[str]]]] = {}
+        # (thread_id, checkpoint_ns, checkpoint_id) -> (task_id, write_idx) -> (task_id, channel, value)
+        self.writes: Dict[Tuple[str, str, str], Dict[Tuple[str, int], Tuple[str, str, Any]]] = {}
+        self._lock = threading.Lock()
+    
+    def _checkpoint_tuple(self, key: CheckpointKey, checkpoint_id: str) -> CheckpointTuple:
+        thread_id, checkpoint_ns = key
+        checkpoint, metadata, parent_id = self.storage[key][checkpoint_id]
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint=copy_checkpoint(checkpoint),
+            metadata=metadata,
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=list(self.writes.get((thread_id, checkpoint_ns, checkpoint_id), {}).values()),
+        )
+    
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        key = _checkpoint_key(config)
+        with self._lock:
+            checkpoints = self.storage.get(key)
+            if not checkpoints:
+                return None
+            # Checkpoint ids sort by creation time
+            checkpoint_id = get_checkpoint_id(config) or max(checkpoints)
+            if checkpoint_id not in checkpoints:
+                return None
+            return self._checkpoint_tuple(key, checkpoint_id)
+    
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config is None:
+                keys = list(self.storage)
+            else:
+                keys = [key for key in self.storage if key[0] == config["configurable"]["thread_id"]]
+                if "checkpoint_ns" in config["configurable"]:
+                    keys = [key for key in keys if key[1] == config["configurable"]["checkpoint_ns"]]
+            before_id = get_checkpoint_id(before) if before else None
+            config_id = get_checkpoint_id(config) if config else None
+            results = []
+            for key in keys:
+                for checkpoint_id in sorted(self.storage[key], reverse=True):
+                    if config_id and checkpoint_id != config_id:
+                        continue
+                    if before_id and checkpoint_id >= before_id:
+                        continue
+                    metadata = self.storage[key][checkpoint_id][1]
+                    if filter and any(metadata.get(k) != v for k, v in filter.items()):
+                        continue
+                    results.append(self._checkpoint_tuple(key, checkpoint_id))
+                    if limit is not None and len(results) >= limit:
+                        break
+                if limit is not None and len(results) >= limit:
+                    break
+        return iter(results)
+    
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store the checkpoint by reference, without serializing it"""
+        thread_id, checkpoint_ns = key = _checkpoint_key(config)
+        with self._lock:
+            self.storage.setdefault(key, {})[checkpoint["id"]] = (
+                checkpoint,
+                # Same run metadata merge as InMemorySaver
+                get_checkpoint_metadata(config, metadata),
+                config["configurable"].get("checkpoint_id"),
+            )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+    
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id, checkpoint_ns = _checkpoint_key(config)
+        writes_key = (thread_id, checkpoint_ns, config["configurable"]["checkpoint_id"])
+        with self._lock:
+            stored = self.writes.setdefault(writes_key, {})
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # Regular writes are only recorded once per task
+                if write_idx >= 0 and (task_id, write_idx) in stored:
+                    continue
+                stored[(task_id, write_idx)] = (task_id, channel, value)
+    
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for checkpoint_key in [key for key in self.storage if key[0] == thread_id]:
+                del self.storage[checkpoint_key]
+            for writes_key in [key for key in self.writes if key[0] == thread_id]:
+                del self.writes[writes_key]
+    
+    # Everything is in memory, so the async API just calls the sync one
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+    
+    async def alist(self, config: Optional[RunnableConfig], **kwargs: Any) -> AsyncIterator[CheckpointTuple]:
+        for checkpoint_tuple in self.list(config, **kwargs):
+            yield checkpoint_tuple
+    
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+    
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+    
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+class DeferredSaver(BaseCheckpointSaver):
+    """Checkpointer that buffers per-node writes and persists once per run
+    
+    Each put replaces the buffered checkpoint for its thread, so only the
+    latest checkpoint (plus its pending writes) reaches the wrapped saver
+    when flush() is called. Channel versions are merged across the
+    buffered puts so the flushed checkpoint still stores every channel.
+    Reads are delegated to the wrapped saver and only see flushed state.
+    """
+    
+    def __init__(self, saver: BaseCheckpointSaver):
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self._pending: Dict[CheckpointKey, Dict[str, Any]] = {}
+        # Sync graphs submit checkpoint writes from a background thread
+        self._lock = threading.Lock()
+    
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Buffer the checkpoint instead of writing it through"""
+        thread_id, checkpoint_ns = key = _checkpoint_key(config)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                # The first buffered checkpoint's parent is the last persisted one
+                pending = self._pending[key] = {"config": config, "new_versions": {}}
+            pending["checkpoint"] = checkpoint
+            pending["metadata"] = metadata
+            pending["new_versions"].update(new_versions)
+            # Writes for the superseded checkpoint are no longer needed
+            pending["writes"] = []
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+    
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Buffer writes for the buffered checkpoint, pass others through"""
+        if not self._buffer_writes(config, writes, task_id, task_path):
+            self.saver.put_writes(config, writes, task_id, task_path)
+    
+    def _buffer_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ) -> bool:
+        """Attach writes to the buffered checkpoint they belong to, if any"""
+        with self._lock:
+            pending = self._pending.get(_checkpoint_key(config))
+            if pending is None or pending["checkpoint"]["id"] != config["configurable"].get("checkpoint_id"):
+                return False
+            pending["writes"].append((config, writes, task_id, task_path))
+            return True
+    
+    def _take_pending(self, thread_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            keys = [key for key in self._pending if key[0] == thread_id]
+            return [self._pending.pop(key) for key in keys]
+    
+    def flush(self, thread_id: str) -> None:
+        """Persist the latest buffered checkpoints of one thread
+        
+        Compiled graphs are shared by concurrent runs, so a run only flushes
+        its own thread and leaves other runs' buffers alone.
+        """
+        for pending in self._take_pending(thread_id):
+            saved_config = self.saver.put(
+                pending["config"], pending["checkpoint"], pending["metadata"], pending["new_versions"]
+            )
+            for _, writes, task_id, task_path in pending["writes"]:
+                self.saver.put_writes(saved_config, writes, task_id, task_path)
+    
+    async def aflush(self, thread_id: str) -> None:
+        """Async version of flush()"""
+        for pending in self._take_pending(thread_id):
+            saved_config = await self.saver.aput(
+                pending["config"], pending["checkpoint"], pending["metadata"], pending["new_versions"]
+            )
+            for _, writes, task_id, task_path in pending["writes"]:
+                await self.saver.aput_writes(saved_config, writes, task_id, task_path)
+    
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.saver.get_tuple(config)
+    
+    def list(self, config: Optional[RunnableConfig], **kwargs: Any) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, **kwargs)
+    
+    def get_next_version(self, current: Optional[Any], channel: Any) -> Any:
+        return self.saver.get_next_version(current, channel)
+    
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == thread_id]:
+                del self._pending[key]
+        self.saver.delete_thread(thread_id)
+    
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+    
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        if not self._buffer_writes(config, writes, task_id, task_path):
+            await self.saver.aput_writes(config, writes, task_id, task_path)
+    
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self.saver.aget_tuple(config)
+    
+    async def alist(self, config: Optional[RunnableConfig], **kwargs: Any) -> AsyncIterator[CheckpointTuple]:
+        async for checkpoint_tuple in self.saver.alist(config, **kwargs):
+            yield checkpoint_tuple
+    
+    async def adelete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == thread_id]:
+                del self._pending[key]
+        await self.saver.adelete_thread(thread_id)
+
+def _thread_ids(config: Any) -> List[str]:
+    """Thread ids named by a run config, or by each config of a batch"""
+    configs = config if isinstance(config, list) else [config]
+    thread_ids = []
+    for run_config in configs:
+        thread_id = ((run_config or {}).get("configurable") or {}).get("thread_id")
+        if thread_id is not None and thread_id not in thread_ids:
+            thread_ids.append(thread_id)
+    return thread_ids
+
+class FlushOnReturnGraph:
+    """Compiled-graph shim that flushes a DeferredSaver when a run ends
+    
+    Each run entry point flushes the threads named in its config, on
+    failure too, so a retry can resume from the last completed step. Every
+    other attribute (get_state, get_graph, ...) is delegated to the wrapped
+    compiled graph.
+    """
+    
+    def __init__(self, graph: Any, saver: DeferredSaver):
+        self._graph = graph
+        self._saver = saver
+    
+    def _flush(self, config: Any) -> None:
+        for thread_id in _thread_ids(config):
+            self._saver.flush(thread_id)
+    
+    async def _aflush(self, config: Any) -> None:
+        for thread_id in _thread_ids(config):
+            await self._saver.aflush(thread_id)
+    
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        try:
+            return self._graph.invoke(input, config, **kwargs)
+        finally:
+            self._flush(config)
+    
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        try:
+            return await self._graph.ainvoke(input, config, **kwargs)
+        finally:
+            await self._aflush(config)
+    
+    def batch(self, inputs: List[Any], config: Any = None, **kwargs: Any) -> List[Any]:
+        try:
+            return self._graph.batch(inputs, config, **kwargs)
+        finally:
+            self._flush(config)
+    
+    async def abatch(self, inputs: List[Any], config: Any = None, **kwargs: Any) -> List[Any]:
+        try:
+            return await self._graph.abatch(inputs, config, **kwargs)
+        finally:
+            await self._aflush(config)
+    
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        try:
+            yield from self._graph.stream(input, config, **kwargs)
+        finally:
+            self._flush(config)
+    
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        try:
+            async for chunk in self._graph.astream(input, config, **kwargs):
+                yield chunk
+        finally:
+            await self._aflush(config)
+    
+    async def astream_events(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        try:
+            async for event in self._graph.astream_events(input, config, **kwargs):
+                yield event
+        finally:
+            await self._aflush(config)
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._graph, name)
@@ -1,27 +1,34 @@
-from typing import TypeVar, Callable, Dict, Any, Optional
-from langgraph.graph import StateGraph, END
+from typing import TypeVar, Callable, Dict, Any, Optional, Union, Literal
+from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
+from langchain_core.messages import BaseMessage
 from temporalio import activity
 
+from .checkpointers import DeferredSaver, FlushOnReturnGraph, LocalMemorySaver
+
 StateType = TypeVar('StateType')
 NodeFunction = Callable[[StateType], StateType]
+# "every_node" persists a checkpoint after each step (LangGraph default),
+# "end_of_workflow" buffers them and persists only the final one per run
+CheckpointMode = Literal["every_node", "end_of_workflow"]
 
 class GraphBuilder:
     """Utility class for building LangGraph StateGraphs with common patterns"""
     
+    # Nodes are tracked by the StateGraph itself, so nothing else is stored
+    __slots__ = ("state_type", "graph")
+    
     def __init__(self, state_type: type):
         self.state_type = state_type
         self.graph = StateGraph(state_type)
-        self.nodes: Dict[str, NodeFunction] = {}
         
     def add_node(self, name: str, func: NodeFunction) -> 'GraphBuilder':
         """Add a node to the graph"""
-        self.nodes[name] = func
         self.graph.add_node(name, func)
         return self
     
-    def add_edge(self, from_node: str, to_node: str) -> 'GraphBuilder':
-        """Add an edge between nodes"""
+    def add_edge(self, from_node: Union[str, list[str]], to_node: str) -> 'GraphBuilder':
+        """Add an edge between nodes (a list of start nodes waits for all of them)"""
         self.graph.add_edge(from_node, to_node)
         return self
     
@@ -41,13 +48,45 @@ class GraphBuilder:
             return self.graph.compile(checkpointer=checkpointer)
         return self.graph.compile()
     
+    def compile_with_checkpointing(
+        self,
+        enable_checkpointing: bool,
+        checkpoint_mode: CheckpointMode = "every_node",
+        serialize_checkpoints: bool = True
+    ):
+        """Compile the graph with the checkpointer selected by the flow options
+        
+        Activity graphs pass enable_checkpointing=False: they only need the
+        final state, and Temporal already retries the whole activity on failure.
+        """
+        if not enable_checkpointing:
+            return self.compile()
+        if serialize_checkpoints:
+            checkpointer = GraphBuilder.create_memory_checkpointer()
+        else:
+            checkpointer = GraphBuilder.create_noop_checkpointer()
+        if checkpoint_mode == "end_of_workflow":
+            deferred = DeferredSaver(checkpointer)
+            return FlushOnReturnGraph(self.compile(checkpointer=deferred), deferred)
+        return self.compile(checkpointer=checkpointer)
+    
     @staticmethod
     def create_memory_checkpointer():
         """Create a simple in-memory checkpointer for basic persistence"""
         return InMemorySaver()
     
     @staticmethod
-    def create_linear_flow(state_type: type, nodes: list[tuple[str, NodeFunction]], enable_checkpointing: bool = False) -> StateGraph:
+    def create_noop_checkpointer():
+        """Create an in-memory checkpointer that skips serialization
+        
+        For graphs that live only as long as one activity run.
+        """
+        return LocalMemorySaver()
+    
+    @staticmethod
+    def create_linear_flow(state_type: type, nodes: list[tuple[str, NodeFunction]], enable_checkpointing: bool = False,
+                           checkpoint_mode: CheckpointMode = "every_node",
+                           serialize_checkpoints: bool = True) -> StateGraph:
         """
         Create a simple linear flow graph where nodes execute in sequence
         
@@ -55,6 +94,9 @@ class GraphBuilder:
             state_type: The TypedDict class for state
             nodes: List of (name, function) tuples
             enable_checkpointing: Whether to enable memory checkpointing
+            checkpoint_mode: When checkpoints are persisted (see CheckpointMode)
+            serialize_checkpoints: False keeps checkpoints as live objects
+                (see create_noop_checkpointer)
         
         Returns:
             Compiled StateGraph
@@ -77,8 +119,50 @@ class GraphBuilder:
             builder.add_edge(nodes[-1][0], END)
         
         # Compile with optional checkpointing
-        checkpointer = GraphBuilder.create_memory_checkpointer() if enable_checkpointing else None
-        return builder.compile(checkpointer=checkpointer)
+        return builder.compile_with_checkpointing(enable_checkpointing, checkpoint_mode, serialize_checkpoints)
+    
+    @staticmethod
+    def create_fan_out_flow(
+        state_type: type,
+        parallel_nodes: list[tuple[str, NodeFunction]],
+        join_node: tuple[str, NodeFunction],
+        enable_checkpointing: bool = False,
+        checkpoint_mode: CheckpointMode = "every_node",
+        serialize_checkpoints: bool = True
+    ) -> StateGraph:
+        """
+        Create a fan-out/fan-in flow where independent nodes run concurrently
+        and a join node runs once all of them have completed
+        
+        Parallel nodes run in the same step, so each must return only the
+        state keys it owns (or keys with a reducer, such as messages).
+        
+        Args:
+            state_type: The TypedDict class for state
+            parallel_nodes: List of (name, function) tuples that run concurrently
+            join_node: (name, function) that runs after all parallel nodes
+            enable_checkpointing: Whether to enable memory checkpointing
+            checkpoint_mode: When checkpoints are persisted (see CheckpointMode)
+            serialize_checkpoints: False keeps checkpoints as live objects
+                (see create_noop_checkpointer)
+        
+        Returns:
+            Compiled StateGraph
+        """
+        builder = GraphBuilder(state_type)
+        
+        # Fan out from START to every parallel node
+        for name, func in parallel_nodes:
+            builder.add_node(name, func)
+            builder.add_edge(START, name)
+        
+        # Fan in: the join node waits for all parallel nodes
+        builder.add_node(join_node[0], join_node[1])
+        builder.add_edge([name for name, _ in parallel_nodes], join_node[0])
+        builder.add_edge(join_node[0], END)
+        
+        # Compile with optional checkpointing
+        return builder.compile_with_checkpointing(enable_checkpointing, checkpoint_mode, serialize_checkpoints)
     
     @staticmethod
     def create_conditional_flow(
@@ -87,7 +171,9 @@ class GraphBuilder:
         conditional_nodes: Dict[str, NodeFunction],
         condition_func: Callable,
         end_node: tuple[str, NodeFunction] = None,
-        enable_checkpointing: bool = False
+        enable_checkpointing: bool = False,
+        checkpoint_mode: CheckpointMode = "every_node",
+        serialize_checkpoints: bool = True
     ) -> StateGraph:
         """
         Create a conditional flow where execution path depends on state
@@ -95,10 +181,14 @@ class GraphBuilder:
         Args:
             state_type: The TypedDict class for state
             entry_node: (name, function) for entry point
-            conditional_nodes: Dict of condition_result -> node_function
+            conditional_nodes: Dict of node name -> node_function; condition_func
+                returns one of these names
             condition_func: Function that returns which path to take
             end_node: Optional final node, if None goes directly to END
             enable_checkpointing: Whether to enable memory checkpointing
+            checkpoint_mode: When checkpoints are persisted (see CheckpointMode)
+            serialize_checkpoints: False keeps checkpoints as live objects
+                (see create_noop_checkpointer)
         
         Returns:
             Compiled StateGraph
@@ -109,59 +199,72 @@ class GraphBuilder:
         builder.add_node(entry_node[0], entry_node[1])
         builder.set_entry_point(entry_node[0])
         
-        # Add conditional nodes
+        # Each key is both the condition result and the node name; route
+        # every node onward in the same pass that adds it
+        next_node = END
+        if end_node:
+            builder.add_node(end_node[0], end_node[1])
+            builder.add_edge(end_node[0], END)
+            next_node = end_node[0]
+        
+        condition_mapping = {}
         for name, func in conditional_nodes.items():
             builder.add_node(name, func)
-        
-        # Create condition mapping
-        condition_mapping = {result: name for result, name in conditional_nodes.items()}
-        if end_node is None:
-            condition_mapping.update({name: END for name in conditional_nodes.keys()})
+            condition_mapping[name] = name
+            builder.add_edge(name, next_node)
         
         # Add conditional edge from entry
         builder.add_conditional_edge(entry_node[0], condition_func, condition_mapping)
         
-        # Add end node if specified
-        if end_node:
-            builder.add_node(end_node[0], end_node[1])
-            for name in conditional_nodes.keys():
-                builder.add_edge(name, end_node[0])
-            builder.add_edge(end_node[0], END)
-        
         # Compile with optional checkpointing
-        checkpointer = GraphBuilder.create_memory_checkpointer() if enable_checkpointing else None
-        return builder.compile(checkpointer=checkpointer)
+        return builder.compile_with_checkpointing(enable_checkpointing, checkpoint_mode, serialize_checkpoints)
 
-def log_graph_execution(phase: str, step: str, details: str = ""):
-    """Helper function for consistent logging across graph executions"""
-    activity.logger.info(f"[{phase} Graph] {step}{f': {details}' if details else ''}")
+def log_graph_execution(phase: str, step: str, details: str = "", *args: Any):
+    """Helper function for consistent logging across graph executions
+    
+    When args are given, details is a %-style format string for them. All
+    formatting is left to the logger, so it is skipped when INFO is disabled.
+    """
+    if not details:
+        activity.logger.info("[%s Graph] %s", phase, step)
+    elif args:
+        activity.logger.info("[%s Graph] %s: " + details, phase, step, *args)
+    else:
+        activity.logger.info("[%s Graph] %s: %s", phase, step, details)
 
 def create_message_summary(messages: list, max_length: int = 1000) -> str:
     """Create a summary of messages for context passing"""
     if not messages:
         return ""
     
-    # Get the last message content
+    # Get the last message content, stringifying only non-text content
     last_message = messages[-1]
-    content = getattr(last_message, 'content', str(last_message))
+    content = last_message.content if isinstance(last_message, BaseMessage) else last_message
+    if not isinstance(content, str):
+        content = str(content)
     
     # Truncate if too long
     if len(content) > max_length:
-        content = content[:max_length] + "..."
+        return content[:max_length] + "..."
     
     return content
 
 def extract_sources_from_search_results(search_results: list) -> list[str]:
-    """Extract and deduplicate sources from search results"""
-    sources = []
+    """Extract and deduplicate sources from SearchResult entries, in first-seen order"""
+    # A dict is an ordered set, so deduplication happens during the scan
+    sources: dict[str, None] = {}
+    saw_duckduckgo = False
     for result in search_results:
-        if result.get("source") not in ["Error", "DuckDuckGo Search"]:
-            sources.append(result["source"])
-        elif result.get("source") == "DuckDuckGo Search" and result.get("urls"):
-            sources.extend(result["urls"])
+        source = result.source
+        if source == "DuckDuckGo Search":
+            saw_duckduckgo = True
+            for url in result.urls:
+                sources.setdefault(url, None)
+        elif source and source != "Error":
+            sources.setdefault(source, None)
     
     # Add generic source if no specific URLs found
-    if not sources and any(result.get("source") == "DuckDuckGo Search" for result in search_results):
-        sources.append("DuckDuckGo Search Results")
+    if not sources and saw_duckduckgo:
+        sources["DuckDuckGo Search Results"] = None
     
-    return list(set(sources))  # Remove duplicates 
\ No newline at end of file
+    return list(sources)
\ No newline at end of file
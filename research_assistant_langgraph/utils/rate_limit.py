@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+class TokenBucket:
+    """Async token bucket that spaces out calls to a rate-limited provider
+    
+    Tokens refill continuously at rate_per_minute / 60 per second, up to
+    capacity. acquire() takes one token, waiting for the refill if none is
+    left; waiters are served in arrival order.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: float = 1.0):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        # Holding the lock while sleeping keeps the bucket atomic and FIFO
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -1,34 +1,44 @@
 import asyncio
-from temporalio.client import Client
 from temporalio.worker import Worker
 from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
 
 from .config import Config
+from .client import get_client
 from .workflow import ResearchAssistantWorkflow
 from .activities.planning_activity import planning_activity_with_langgraph
-from .activities.research_activity import research_section_activity_with_langgraph
+from .activities.research_activity import (
+    research_section_activity_with_langgraph,
+    research_sections_batched_activity_with_langgraph,
+)
 from .activities.report_activity import report_generation_activity_with_langgraph
 
+# Modules the workflow sandbox imports once and shares instead of
+# re-importing per run; a name also covers all of its submodules
+PASSTHROUGH_MODULES = (
+    "langchain_core",
+    "langchain_openai",
+    "langchain_anthropic",
+    "langchain_community",
+    "langgraph",
+    "requests",
+    "urllib3",
+    "httpx",
+    "httpcore",
+    "pydantic",
+    "openai",
+    "anthropic",
+    "duckduckgo_search",
+)
+
+# Configure sandbox to allow LangChain and related imports
+SANDBOX_RESTRICTIONS = SandboxRestrictions.default.with_passthrough_modules(*PASSTHROUGH_MODULES)
+
 async def run_research_worker() -> None:
     """Run the LangGraph-enabled research assistant worker"""
-    client = await Client.connect(Config.TEMPORAL_HOST)
+    client = await get_client()
     
-    # Configure sandbox to allow LangChain and related imports
-    restrictions = SandboxRestrictions.default.with_passthrough_modules(
-        "langchain_core",
-        "langchain_openai", 
-        "langchain_anthropic",
-        "langchain_community",
-        "langgraph",
-        "requests",
-        "urllib3",
-        "httpx",
-        "httpcore",
-        "pydantic",
-        "openai",
-        "anthropic",
-        "duckduckgo_search"
-    )
+    # Share one LLM response cache across every activity in this worker
+    llm_cache_enabled = Config.configure_llm_cache()
     
     worker = Worker(
         client,
@@ -37,9 +47,10 @@ async def run_research_worker() -> None:
         activities=[
             planning_activity_with_langgraph, 
             research_section_activity_with_langgraph, 
+            research_sections_batched_activity_with_langgraph,
             report_generation_activity_with_langgraph
         ],
-        workflow_runner=SandboxedWorkflowRunner(restrictions=restrictions)
+        workflow_runner=SandboxedWorkflowRunner(restrictions=SANDBOX_RESTRICTIONS)
     )
     
     print(f"🔬 LangGraph-enabled Research Worker started")
@@ -47,6 +58,7 @@ async def run_research_worker() -> None:
     print(f"📋 Task Queue: {Config.RESEARCH_TASK_QUEUE}")
     print(f"🤖 LLM Provider: {Config.DEFAULT_LLM_PROVIDER}")
     print(f"🔍 Search Provider: {Config.DEFAULT_SEARCH_PROVIDER}")
+    print(f"💾 LLM Cache: {Config.LLM_CACHE_PATH if llm_cache_enabled else 'disabled'}")
     print(f"🔓 Sandbox: Configured with passthrough modules")
     print("=" * 60)
     
@@ -1,12 +1,27 @@
 import asyncio
 from datetime import timedelta
+from typing import Any, Dict, List, Optional
 from temporalio import workflow
 from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError, ApplicationError
 
-from .schemas.types import ResearchState
-from .activities.planning_activity import planning_activity_with_langgraph
-from .activities.research_activity import research_section_activity_with_langgraph
-from .activities.report_activity import report_generation_activity_with_langgraph
+from .schemas.types import ResearchSection, ResearchState
+
+# Activity modules build LangChain prompts at import time; pass them through
+# the sandbox instead of re-importing them for every workflow run
+with workflow.unsafe.imports_passed_through():
+    from .activities.planning_activity import planning_activity_with_langgraph
+    from .activities.research_activity import (
+        MAX_BATCHED_SECTIONS,
+        research_section_activity_with_langgraph,
+        research_sections_batched_activity_with_langgraph,
+    )
+    from .activities.report_activity import report_generation_activity_with_langgraph
+
+# Sections are synthesized in shared LLM calls of at most this many
+# sections (bounded by the call's output token budget); a failed batch
+# fans out one activity per section
+_SECTION_BATCH_CAP = MAX_BATCHED_SECTIONS
 
 @workflow.defn
 class ResearchAssistantWorkflow:
@@ -38,7 +53,7 @@ class ResearchAssistantWorkflow:
             
             research_plan = await workflow.execute_activity(
                 planning_activity_with_langgraph,
-                args=[research_topic, max_sections],
+                args=[research_topic, max_sections, search_depth],
                 start_to_close_timeout=timedelta(minutes=5),
                 retry_policy=RetryPolicy(maximum_attempts=2)
             )
@@ -46,24 +61,66 @@ class ResearchAssistantWorkflow:
             state["research_plan"] = research_plan
             state["plan_approved"] = True
             
-            # Phase 2: LangGraph-based Research (parallel)
+            # Phase 2: LangGraph-based Research (batched, or parallel per section)
             workflow.logger.info("Phase 2: LangGraph Research")
             state["current_phase"] = "research"
             
-            section_activities = []
-            for section_title in research_plan["sections"]:
-                activity = workflow.execute_activity(
+            sections = research_plan["sections"]
+            section_results: List[Optional[ResearchSection]] = [None] * len(sections)
+            
+            async def research_section(index: int, section_title: str, queries: List[str], search_results: Optional[list]):
+                section_result = await workflow.execute_activity(
                     research_section_activity_with_langgraph,
-                    args=[section_title, research_topic, search_depth],
+                    args=[section_title, research_topic, search_depth, queries, search_results],
                     start_to_close_timeout=timedelta(minutes=15),
                     retry_policy=RetryPolicy(maximum_attempts=2)
                 )
-                section_activities.append(activity)
+                return index, section_result
+            
+            async def research_batch(start: int, batch: List[str]) -> None:
+                try:
+                    section_results[start:start + len(batch)] = await workflow.execute_activity(
+                        research_sections_batched_activity_with_langgraph,
+                        args=[batch, research_topic, search_depth, research_plan["queries_by_section"]],
+                        start_to_close_timeout=timedelta(minutes=15),
+                        # The per-section fan-out below is the retry
+                        retry_policy=RetryPolicy(maximum_attempts=1)
+                    )
+                    return
+                except ActivityError as e:
+                    workflow.logger.warning(f"Batched research failed, researching sections individually: {e}")
+                    # Reuse the failed batch's queries and searches when it got that far
+                    previous: Dict[str, Any] = {}
+                    if isinstance(e.cause, ApplicationError) and e.cause.details:
+                        previous = e.cause.details[0]
+                
+                queries_by_section = previous.get("queries_by_section", research_plan["queries_by_section"])
+                results_by_section = previous.get("search_results_by_section", {})
+                
+                # Handle each section as soon as it finishes instead of waiting
+                # on the slowest one; the index keeps the plan's section order
+                for next_done in workflow.as_completed([
+                    research_section(index, section_title, queries_by_section.get(section_title, []), results_by_section.get(section_title))
+                    for index, section_title in enumerate(batch, start)
+                ]):
+                    index, section_result = await next_done
+                    section_results[index] = section_result
+                    workflow.logger.info(f"Researched section {index + 1}/{len(sections)}: {sections[index]}")
             
-            section_results = await asyncio.gather(*section_activities)
+            await asyncio.gather(*[
+                research_batch(start, sections[start:start + _SECTION_BATCH_CAP])
+                for start in range(0, len(sections), _SECTION_BATCH_CAP)
+            ])
             
+            # Tally report metadata while collecting the sections
+            total_sources = 0
+            total_queries = 0
             for section_result in section_results:
+                # Every slot is filled once all batches have finished
+                assert section_result is not None
                 state["completed_sections"].append(section_result)
+                total_sources += len(section_result["sources"])
+                total_queries += len(section_result.get("queries_used", ()))
             
             # Phase 3: LangGraph-based Report Generation
             workflow.logger.info("Phase 3: LangGraph Report Generation")
@@ -79,10 +136,10 @@ class ResearchAssistantWorkflow:
             state["final_report"] = final_report
             state["report_metadata"] = {
                 "sections_count": len(state["completed_sections"]),
-                "total_sources": sum(len(section["sources"]) for section in state["completed_sections"]),
+                "total_sources": total_sources,
                 "word_count": len(final_report.split()),
                 "generated_at": workflow.now().isoformat(),
-                "total_queries": sum(len(section.get("queries_used", [])) for section in state["completed_sections"])
+                "total_queries": total_queries
             }
             
             state["current_phase"] = "complete"
@@ -0,0 +1,162 @@
+import asyncio
+import copy
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+
+from research_assistant_langgraph.utils.graph_builder import GraphBuilder
+
+class StepState(TypedDict):
+    steps: Annotated[List[str], operator.add]
+
+def _build_graph(failures: dict, **checkpoint_options):
+    """Linear a -> b -> c graph; b raises while failures["b"] is positive"""
+    calls = {"a": 0, "b": 0, "c": 0}
+    
+    def make_node(name: str):
+        def node(state: StepState) -> StepState:
+            calls[name] += 1
+            if failures.get(name, 0) > 0:
+                failures[name] -= 1
+                raise RuntimeError(f"{name} failed")
+            return {"steps": [name]}
+        return node
+    
+    graph = GraphBuilder.create_linear_flow(
+        StepState,
+        [(name, make_node(name)) for name in ("a", "b", "c")],
+        enable_checkpointing=True,
+        **checkpoint_options
+    )
+    return graph, calls
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+def test_end_of_workflow_persists_final_state():
+    graph, _ = _build_graph({}, checkpoint_mode="end_of_workflow")
+    
+    result = graph.invoke({"steps": []}, _config("t1"))
+    
+    assert result["steps"] == ["a", "b", "c"]
+    snapshot = graph.get_state(_config("t1"))
+    assert snapshot.values["steps"] == ["a", "b", "c"]
+    assert snapshot.next == ()
+
+def test_end_of_workflow_resumes_after_failing_node():
+    failures = {"b": 1}
+    graph, calls = _build_graph(failures, checkpoint_mode="end_of_workflow")
+    
+    with pytest.raises(RuntimeError):
+        graph.invoke({"steps": []}, _config("t1"))
+    
+    snapshot = graph.get_state(_config("t1"))
+    assert snapshot.values["steps"] == ["a"]
+    assert snapshot.next == ("b",)
+    
+    result = graph.invoke(None, _config("t1"))
+    
+    assert result["steps"] == ["a", "b", "c"]
+    assert calls == {"a": 1, "b": 2, "c": 1}
+
+def test_end_of_workflow_flushes_only_the_finished_thread():
+    async def scenario():
+        entered = asyncio.Event()
+        release = asyncio.Event()
+        
+        async def wait_node(state: StepState) -> StepState:
+            entered.set()
+            await release.wait()
+            return {"steps": ["wait"]}
+        
+        async def done_node(state: StepState) -> StepState:
+            return {"steps": ["done"]}
+        
+        def route(state: StepState) -> str:
+            return "wait" if not state["steps"] else "done"
+        
+        graph = GraphBuilder.create_conditional_flow(
+            StepState,
+            ("start", lambda state: {}),
+            {"wait": wait_node, "done": done_node},
+            route,
+            enable_checkpointing=True,
+            checkpoint_mode="end_of_workflow"
+        )
+        
+        slow_run = asyncio.create_task(graph.ainvoke({"steps": []}, _config("slow")))
+        await entered.wait()
+        await graph.ainvoke({"steps": ["x"]}, _config("fast"))
+        
+        # The fast run's flush must not persist the slow run's buffered steps
+        assert (await graph.aget_state(_config("fast"))).values["steps"] == ["x", "done"]
+        assert (await graph.aget_state(_config("slow"))).values == {}
+        
+        release.set()
+        await slow_run
+        assert (await graph.aget_state(_config("slow"))).values["steps"] == ["wait"]
+    
+    asyncio.run(scenario())
+
+def test_end_of_workflow_flushes_batch_runs():
+    async def scenario():
+        graph, _ = _build_graph({}, checkpoint_mode="end_of_workflow")
+        
+        await graph.abatch([{"steps": []}, {"steps": []}], [_config("t1"), _config("t2")])
+        
+        for thread_id in ("t1", "t2"):
+            assert (await graph.aget_state(_config(thread_id))).values["steps"] == ["a", "b", "c"]
+    
+    asyncio.run(scenario())
+
+@pytest.mark.parametrize("checkpoint_mode", ["every_node", "end_of_workflow"])
+def test_unserialized_checkpoints_round_trip(checkpoint_mode):
+    failures = {"b": 1}
+    graph, calls = _build_graph(failures, checkpoint_mode=checkpoint_mode, serialize_checkpoints=False)
+    
+    with pytest.raises(RuntimeError):
+        graph.invoke({"steps": []}, _config("t1"))
+    
+    snapshot = graph.get_state(_config("t1"))
+    assert snapshot.values["steps"] == ["a"]
+    assert snapshot.next == ("b",)
+    
+    result = graph.invoke(None, _config("t1"))
+    
+    assert result["steps"] == ["a", "b", "c"]
+    assert calls == {"a": 1, "b": 2, "c": 1}
+    assert graph.get_state(_config("t1")).next == ()
+    assert len(list(graph.get_state_history(_config("t1")))) > 0
+
+def test_unserialized_checkpoints_keep_run_metadata():
+    graph, _ = _build_graph({}, serialize_checkpoints=False)
+    config = {"configurable": {"thread_id": "t1"}, "metadata": {"run_tag": "x"}}
+    
+    graph.invoke({"steps": []}, config)
+    
+    assert graph.get_state(_config("t1")).metadata["run_tag"] == "x"
+
+def test_unserialized_checkpoints_survive_a_resume():
+    failures = {"b": 1}
+    graph, _ = _build_graph(failures, serialize_checkpoints=False)
+    
+    with pytest.raises(RuntimeError):
+        graph.invoke({"steps": []}, _config("t1"))
+    
+    def history():
+        return {
+            snapshot.config["configurable"]["checkpoint_id"]: (
+                dict(snapshot.values),
+                snapshot.next,
+                copy.deepcopy(graph.checkpointer.get_tuple(snapshot.config).checkpoint)
+            )
+            for snapshot in graph.get_state_history(_config("t1"))
+        }
+    
+    before = history()
+    graph.invoke(None, _config("t1"))
+    after = history()
+    
+    # Resuming must not rewrite the checkpoints it started from
+    assert {checkpoint_id: after[checkpoint_id] for checkpoint_id in before} == before
\ No newline at end of file
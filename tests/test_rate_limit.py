@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+from research_assistant_langgraph.config import _build_search_rate_limiter
+from research_assistant_langgraph.utils.rate_limit import TokenBucket
+
+async def _time_acquires(bucket: TokenBucket, count: int) -> float:
+    started = time.monotonic()
+    for _ in range(count):
+        await bucket.acquire()
+    return time.monotonic() - started
+
+def test_token_bucket_spaces_acquires():
+    # 600 per minute is one token every 0.1s; the first one is available at once
+    elapsed = asyncio.run(_time_acquires(TokenBucket(600), 5))
+    
+    assert 0.38 <= elapsed < 0.8
+
+def test_token_bucket_bursts_up_to_capacity():
+    async def scenario():
+        bucket = TokenBucket(600, capacity=3)
+        burst = await _time_acquires(bucket, 3)
+        paced = await _time_acquires(bucket, 1)
+        return burst, paced
+    
+    burst, paced = asyncio.run(scenario())
+    
+    assert burst < 0.05
+    assert 0.08 <= paced < 0.5
+
+def test_token_bucket_serves_concurrent_waiters_in_order():
+    async def scenario():
+        bucket = TokenBucket(600)
+        order = []
+        
+        async def acquire(i: int):
+            await bucket.acquire()
+            order.append(i)
+        
+        await asyncio.gather(*[acquire(i) for i in range(4)])
+        return order
+    
+    assert asyncio.run(scenario()) == [0, 1, 2, 3]
+
+def test_search_rate_limiter_does_not_burst():
+    assert _build_search_rate_limiter(0) is None
+    assert _build_search_rate_limiter(60).capacity == 1
\ No newline at end of file